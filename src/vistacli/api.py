@@ -1,39 +1,277 @@
 """Vista Social API client."""
 
+import atexit
 import logging
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Union
+from urllib.parse import quote
 
 import httpx
+import orjson
 
 from .auth import VSAuth
+from .cache import VSCache
 
 logger = logging.getLogger(__name__)
 
+# Seconds a folder listing is served from the cache
+FOLDERS_CACHE_TTL = 30
 
-class VSApi:
-    """Vista Social API client."""
+# Per-endpoint headers matching what the Vista Social UI sends, built once at
+# import and shared read-only by every request. Headers common to all
+# endpoints are session defaults (see VSAuth.create_session).
+_GET_FOLDERS_HEADERS = MappingProxyType({
+    'Referer': 'https://vistasocial.com/media',
+    'Content-Type': 'application/json',
+    'Priority': 'u=4'
+})
+
+_CREATE_FOLDER_HEADERS = MappingProxyType({
+    'Referer': 'https://vistasocial.com/media?',
+    'Content-Type': 'application/json',
+    'Origin': 'https://vistasocial.com',
+    'Priority': 'u=0',
+    'TE': 'trailers'
+})
+
+_DELETE_FOLDER_HEADERS = MappingProxyType({
+    'Referer': 'https://vistasocial.com/media?',
+    'Content-Type': 'application/json',
+    'Origin': 'https://vistasocial.com',
+    'Priority': 'u=0'
+})
+
+
+def _log_request(method: str, url: Any, headers: Mapping[str, str], params: Optional[Dict[str, str]] = None, payload: Any = None) -> None:
+    """Log an outgoing request as a single DEBUG record."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("vsdir: %s %s\n  headers=%s\n  params=%s\n  payload=%s", method, url, headers, params, payload)
+
+
+def _log_response(response: httpx.Response, body: Any = None) -> None:
+    """Log a response as a single DEBUG record."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("vsdir: Response %s\n  headers=%s\n  body=%s", response.status_code, response.headers, body)
+
+
+@dataclass(frozen=True)
+class _RequestRecipe:
+    """The fixed parts of one endpoint's requests, prepared at class load.
+    
+    Building a request only fills in what varies per call: the Referer for
+    a media path, a trailing path segment, params and the JSON body.
+    """
+    
+    __slots__ = ('method', 'url', 'headers', 'referer_template')
+    
+    method: str
+    url: httpx.URL
+    headers: Mapping[str, str]
+    referer_template: Optional[str]
+    
+    def build(self, client: Union[httpx.Client, httpx.AsyncClient], media_path: Optional[str] = None, path: Optional[str] = None, params: Optional[Dict[str, str]] = None, payload: Any = None) -> httpx.Request:
+        """Build a request on client, which adds its default headers and cookies."""
+        headers = self.headers
+        if media_path and self.referer_template:
+            headers = {**headers, 'Referer': self.referer_template.format(media_path=media_path)}
+            
+        url = self.url
+        if path is not None:
+            # Quote the segment so IDs containing '/', '?' or '#' stay one
+            # path segment instead of being rejected as an invalid URL
+            url = url.copy_with(path=f"{url.path}/{quote(path, safe='')}")
+            
+        _log_request(self.method, url, headers, params=params, payload=payload)
+        return client.build_request(self.method, url, params=params, json=payload, headers=headers)
+
+
+class _BaseVSApi:
+    """Request building and response handling shared by the API clients."""
     
     BASE_URL = "https://vistasocial.com"
     
-    def __init__(self, auth: Optional[VSAuth] = None):
+    # Endpoint recipes; URLs are parsed once instead of on every request
+    _GET_FOLDERS = _RequestRecipe(
+        "GET", httpx.URL(f"{BASE_URL}/api/publishing/media/folders"), _GET_FOLDERS_HEADERS, None
+    )
+    _CREATE_FOLDER = _RequestRecipe(
+        "POST", httpx.URL(f"{BASE_URL}/api/publishing/media/folder"), _CREATE_FOLDER_HEADERS, f"{BASE_URL}/media/{{media_path}}"
+    )
+    _DELETE_FOLDER = _RequestRecipe(
+        "DELETE", httpx.URL(f"{BASE_URL}/api/publishing/media/folder"), _DELETE_FOLDER_HEADERS, None
+    )
+    
+    def __init__(self, auth: Optional[VSAuth] = None, use_cache: bool = True):
         """Initialize the API client.
         
         Args:
             auth: Authentication handler. If None, creates a new one.
+            use_cache: Serve folder listings from the on-disk cache
         """
         self.auth = auth or VSAuth()
+        self.cache = VSCache() if use_cache else None
+    
+    def _folders_cache_key(self, media_path: Optional[str], query: str) -> str:
+        """Cache key for a folder listing.
+        
+        The key covers the account's cookies, so listings cached for one
+        auth file are never served to another. Keys are hashed, so the
+        cookies aren't written to the cache.
+        """
+        account = sorted(self.auth.load_cookies().items())
+        return VSCache.make_key('folders', account, media_path, query)
+    
+    def _cached_folders(self, key: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Return a fresh cached folder listing, if any."""
+        if not self.cache:
+            return None
+            
+        folders = self.cache.get(key)
+        if folders is not None:
+            logger.info(f"vsdir: retrieved {len(folders)} folders from cache")
+        return folders
+    
+    def _store_folders(self, key: Optional[str], folders: List[Dict[str, Any]]) -> None:
+        """Cache a folder listing."""
+        if self.cache:
+            self.cache.set(key, folders, FOLDERS_CACHE_TTL)
+    
+    def _stale_folders(self, key: Optional[str], error: Exception) -> Optional[List[Dict[str, Any]]]:
+        """Return an expired cached folder listing after a network failure."""
+        if not self.cache:
+            return None
+            
+        folders = self.cache.get(key, allow_stale=True)
+        if folders is not None:
+            logger.warning(f"vsdir: failed to get folders ({error}), using cached listing")
+        return folders
+    
+    def _invalidate_folders(self) -> None:
+        """Drop cached folder listings after a folder is created or deleted."""
+        if self.cache:
+            self.cache.invalidate('folders:')
+    
+    def _get_folders_request(self, media_path: Optional[str], query: str) -> httpx.Request:
+        """Build the request for listing folders."""
+        params = {"q": query}
+        if media_path:
+            params["media_path"] = media_path
+            
+        return self._GET_FOLDERS.build(self.client, params=params)
+    
+    def _get_folders_response(self, response: httpx.Response) -> List[Dict[str, Any]]:
+        """Check a folder listing response and extract the folders."""
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        _log_response(response, data)
+        
+        folders = data.get('data', [])
+        logger.info(f"vsdir: retrieved {len(folders)} folders")
+        return folders
+    
+    def _create_folder_request(self, name: str, description: str, labels: Optional[List[str]], entity_gids: Optional[List[str]], media_path: Optional[str]) -> httpx.Request:
+        """Build the request for creating a folder."""
+        payload = {
+            "title": name,
+            "description": description,
+            "media_path": [media_path] if media_path else None,
+            "labels": labels or [],
+            "entity_gids": entity_gids or []
+        }
+        
+        return self._CREATE_FOLDER.build(self.client, media_path=media_path, payload=payload)
+    
+    def _create_folder_response(self, response: httpx.Response, name: str) -> Dict[str, Any]:
+        """Check a folder creation response and return the created folder."""
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        _log_response(response, data)
+        
+        # Check for error in response body
+        if 'error' in data:
+            error_msg = data['error']
+            logger.error(f"vsdir: API returned error: {error_msg}")
+            raise httpx.HTTPStatusError(f"API Error: {error_msg}", request=response.request, response=response)
+            
+        self._invalidate_folders()
+        logger.info(f"vsdir: created folder '{name}'")
+        return data
+    
+    def _delete_folder_request(self, folder_id: str) -> httpx.Request:
+        """Build the request for deleting a folder."""
+        return self._DELETE_FOLDER.build(self.client, path=folder_id)
+    
+    def _delete_folder_response(self, response: httpx.Response, folder_id: str) -> None:
+        """Check a folder deletion response."""
+        response.raise_for_status()
+        
+        _log_response(response)
+        
+        self._invalidate_folders()
+        logger.info(f"vsdir: deleted folder '{folder_id}'")
+
+
+class VSApi(_BaseVSApi):
+    """Vista Social API client."""
+    
+    # Process-wide clients handed out by get_shared, by (auth file, use_cache)
+    _shared_instances: Dict[Tuple[str, bool], 'VSApi'] = {}
+    
+    def __init__(self, auth: Optional[VSAuth] = None, use_cache: bool = True):
+        """Initialize the API client.
+        
+        Args:
+            auth: Authentication handler. If None, creates a new one.
+            use_cache: Serve folder listings from the on-disk cache
+        """
+        super().__init__(auth, use_cache)
         self.client: Optional[httpx.Client] = None
+        self._shared = False
+    
+    @classmethod
+    def get_shared(cls, auth_file: Optional[Path] = None, use_cache: bool = True) -> 'VSApi':
+        """Return the process-wide client for an auth file.
+        
+        The client and its connection pool are created on first use, reused
+        by every later call in the same process and closed at exit.
         
+        Args:
+            auth_file: Path to auth file. Defaults to ~/.vsauth
+            use_cache: Serve folder listings from the on-disk cache
+        """
+        auth = VSAuth(auth_file)
+        key = (str(auth.auth_file), use_cache)
+        
+        api = cls._shared_instances.get(key)
+        if api is None:
+            api = cls(auth=auth, use_cache=use_cache)
+            api._shared = True
+            cls._shared_instances[key] = api
+            atexit.register(api.close)
+        return api
+    
     def __enter__(self):
         """Context manager entry."""
-        self.client = self.auth.create_session()
+        self._ensure_client()
         return self
-        
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit."""
+        """Context manager exit. Shared clients stay open until exit."""
+        if not self._shared:
+            self.close()
+    
+    def close(self) -> None:
+        """Close the underlying session. Safe to call more than once."""
         if self.client:
             self.client.close()
-            
+            self.client = None
+    
     def _ensure_client(self):
         """Ensure client is initialized."""
         if not self.client:
@@ -42,6 +280,9 @@ class VSApi:
     def get_folders(self, media_path: Optional[str] = None, query: str = "") -> List[Dict[str, Any]]:
         """Get list of folders.
         
+        Fresh listings are served from the cache; if the server cannot be
+        reached, an expired cached listing is returned instead of failing.
+        
         Args:
             media_path: Optional parent folder ID for subfolder listing
             query: Optional search query
@@ -52,47 +293,28 @@ class VSApi:
         Raises:
             httpx.HTTPError: If API request fails
         """
+        # Only build the key when caching, since it reads the cookies
+        key = self._folders_cache_key(media_path, query) if self.cache else None
+        folders = self._cached_folders(key)
+        if folders is not None:
+            return folders
+            
         self._ensure_client()
         
-        url = f"{self.BASE_URL}/api/publishing/media/folders"
-        params = {"q": query}
-        if media_path:
-            params["media_path"] = media_path
-            
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': 'https://vistasocial.com/media',
-            'Content-Type': 'application/json',
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=4'
-        }
+        request = self._get_folders_request(media_path, query)
         
         try:
-            logger.debug(f"vsdir: GET {url}")
-            logger.debug(f"vsdir: Headers: {headers}")
-            logger.debug(f"vsdir: Params: {params}")
-            
-            response = self.client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
-            logger.debug(f"vsdir: Response status: {response.status_code}")
-            logger.debug(f"vsdir: Response headers: {dict(response.headers)}")
-            
-            data = response.json()
-            logger.debug(f"vsdir: Response body: {data}")
-            
-            folders = data.get('data', [])
-            logger.info(f"vsdir: retrieved {len(folders)} folders")
+            response = self.client.send(request)
+            folders = self._get_folders_response(response)
+            self._store_folders(key, folders)
             return folders
             
+        except httpx.TransportError as e:
+            folders = self._stale_folders(key, e)
+            if folders is not None:
+                return folders
+            logger.error(f"vsdir: failed to get folders: {e}")
+            raise
         except httpx.HTTPError as e:
             logger.error(f"vsdir: failed to get folders: {e}")
             raise
@@ -115,68 +337,142 @@ class VSApi:
         """
         self._ensure_client()
         
-        # Actual Vista Social API endpoint
-        url = f"{self.BASE_URL}/api/publishing/media/folder"
+        request = self._create_folder_request(name, description, labels, entity_gids, media_path)
         
-        payload = {
-            "title": name,
-            "description": description,
-            "media_path": [media_path] if media_path else None,
-            "labels": labels or [],
-            "entity_gids": entity_gids or []
-        }
+        try:
+            response = self.client.send(request)
+            return self._create_folder_response(response, name)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"vsdir: failed to create folder '{name}': {e}")
+            raise
+    
+    def delete_folder(self, folder_id: str) -> None:
+        """Delete a folder.
         
-        # Update headers to match Vista Social's expected format
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'https://vistasocial.com/media/{media_path}' if media_path else 'https://vistasocial.com/media?',
-            'Content-Type': 'application/json',
-            'Origin': 'https://vistasocial.com',
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=0',
-            'TE': 'trailers'
-        }
+        Args:
+            folder_id: ID of the folder to delete
+            
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        self._ensure_client()
+        
+        request = self._delete_folder_request(folder_id)
         
         try:
-            # Log request details at DEBUG level
-            logger.debug(f"vsdir: POST {url}")
-            logger.debug(f"vsdir: Headers: {headers}")
-            logger.debug(f"vsdir: Payload: {payload}")
-            logger.debug(f"vsdir: Request headers: {dict(self.client.headers)}")
+            response = self.client.send(request)
+            self._delete_folder_response(response, folder_id)
+            
+        except httpx.HTTPError as e:
+            logger.error(f"vsdir: failed to delete folder '{folder_id}': {e}")
+            raise
+
+
+class AsyncVSApi(_BaseVSApi):
+    """Asynchronous Vista Social API client.
+    
+    Mirrors VSApi, but every request is a coroutine so many folder
+    operations can be in flight at once over one connection pool.
+    """
+    
+    def __init__(self, auth: Optional[VSAuth] = None, use_cache: bool = True):
+        """Initialize the API client.
+        
+        Args:
+            auth: Authentication handler. If None, creates a new one.
+            use_cache: Serve folder listings from the on-disk cache
+        """
+        super().__init__(auth, use_cache)
+        self.client: Optional[httpx.AsyncClient] = None
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        self._ensure_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+    
+    def _ensure_client(self):
+        """Ensure client is initialized."""
+        if not self.client:
+            self.client = self.auth.create_async_session()
+    
+    async def get_folders(self, media_path: Optional[str] = None, query: str = "") -> List[Dict[str, Any]]:
+        """Get list of folders.
+        
+        Fresh listings are served from the cache; if the server cannot be
+        reached, an expired cached listing is returned instead of failing.
+        
+        Args:
+            media_path: Optional parent folder ID for subfolder listing
+            query: Optional search query
             
-            response = self.client.post(url, json=payload, headers=headers)
-            response.raise_for_status()
+        Returns:
+            List of folder dictionaries
             
-            # Log response details at DEBUG level
-            logger.debug(f"vsdir: Response status: {response.status_code}")
-            logger.debug(f"vsdir: Response headers: {dict(response.headers)}")
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        # Only build the key when caching, since it reads the cookies
+        key = self._folders_cache_key(media_path, query) if self.cache else None
+        folders = self._cached_folders(key)
+        if folders is not None:
+            return folders
             
-            data = response.json()
-            logger.debug(f"vsdir: Response body: {data}")
+        self._ensure_client()
+        
+        request = self._get_folders_request(media_path, query)
+        
+        try:
+            response = await self.client.send(request)
+            folders = self._get_folders_response(response)
+            self._store_folders(key, folders)
+            return folders
+            
+        except httpx.TransportError as e:
+            folders = self._stale_folders(key, e)
+            if folders is not None:
+                return folders
+            logger.error(f"vsdir: failed to get folders: {e}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"vsdir: failed to get folders: {e}")
+            raise
+    
+    async def create_folder(self, name: str, description: str = "", labels: Optional[List[str]] = None, entity_gids: Optional[List[str]] = None, media_path: Optional[str] = None) -> Dict[str, Any]:
+        """Create a new folder.
+        
+        Args:
+            name: Title of the folder to create
+            description: Description of the folder
+            labels: List of labels/tags for the folder
+            entity_gids: List of entity GIDs (group IDs) for the folder
+            media_path: Optional parent folder ID for creating subfolders
             
-            # Check for error in response body
-            if 'error' in data:
-                error_msg = data['error']
-                logger.error(f"vsdir: API returned error: {error_msg}")
-                raise httpx.HTTPStatusError(f"API Error: {error_msg}", request=response.request, response=response)
+        Returns:
+            Created folder data
             
-            logger.info(f"vsdir: created folder '{name}'")
-            return data
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        self._ensure_client()
+        
+        request = self._create_folder_request(name, description, labels, entity_gids, media_path)
+        
+        try:
+            response = await self.client.send(request)
+            return self._create_folder_response(response, name)
             
         except httpx.HTTPError as e:
             logger.error(f"vsdir: failed to create folder '{name}': {e}")
             raise
     
-
-    
-    def delete_folder(self, folder_id: str) -> None:
+    async def delete_folder(self, folder_id: str) -> None:
         """Delete a folder.
         
         Args:
@@ -187,36 +483,12 @@ class VSApi:
         """
         self._ensure_client()
         
-        url = f"{self.BASE_URL}/api/publishing/media/folder/{folder_id}"
-        
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': 'https://vistasocial.com/media?',
-            'Content-Type': 'application/json',
-            'Origin': 'https://vistasocial.com',
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=0'
-        }
+        request = self._delete_folder_request(folder_id)
         
         try:
-            logger.debug(f"vsdir: DELETE {url}")
-            logger.debug(f"vsdir: Headers: {headers}")
-            
-            response = self.client.delete(url, headers=headers)
-            response.raise_for_status()
-            
-            logger.debug(f"vsdir: Response status: {response.status_code}")
-            logger.debug(f"vsdir: Response headers: {dict(response.headers)}")
-            
-            logger.info(f"vsdir: deleted folder '{folder_id}'")
+            response = await self.client.send(request)
+            self._delete_folder_response(response, folder_id)
             
         except httpx.HTTPError as e:
             logger.error(f"vsdir: failed to delete folder '{folder_id}': {e}")
-            raise 
\ No newline at end of file
+            raise
@@ -2,15 +2,31 @@
 
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-import browser_cookie3
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
+def _firefox_cookies(domain_name: str) -> Tuple[Tuple[str, str], ...]:
+    """Read cookies for a domain from Firefox's cookie database."""
+    # Imported here: browser_cookie3 loads sqlite and keyring support that
+    # only cookie extraction needs
+    import browser_cookie3
+    
+    cookies = browser_cookie3.firefox(domain_name=domain_name)
+    return tuple((cookie.name, cookie.value) for cookie in cookies)
+
+
+# Parsed auth files by (path, mtime_ns), oldest first
+_COOKIE_CACHE: Dict[Tuple[str, int], Dict[str, str]] = {}
+_COOKIE_CACHE_SIZE = 4
+
+
 class VSAuth:
     """Vista Social authentication handler."""
     
@@ -37,10 +53,10 @@ class VSAuth:
         """
         try:
             # Extract cookies from Firefox
-            cookies = browser_cookie3.firefox(domain_name='vistasocial.com')
+            cookies = _firefox_cookies('vistasocial.com')
             
             # Convert to dictionary
-            cookie_dict = {cookie.name: cookie.value for cookie in cookies}
+            cookie_dict = dict(cookies)
             
             if not cookie_dict:
                 raise RuntimeError("No cookies found for vistasocial.com in Firefox")
@@ -52,6 +68,13 @@ class VSAuth:
             logger.error(f"vsauth: failed to extract cookies: {e}")
             raise RuntimeError(f"Failed to extract cookies: {e}")
     
+    def auth_file_age(self) -> Optional[float]:
+        """Return the age of the auth file in seconds, or None if it doesn't exist."""
+        try:
+            return time.time() - self.auth_file.stat().st_mtime
+        except FileNotFoundError:
+            return None
+    
     def save_cookies(self, cookies: Dict[str, str]) -> None:
         """Save cookies to auth file.
         
@@ -83,11 +106,21 @@ class VSAuth:
             RuntimeError: If auth file is invalid
         """
         try:
-            if not self.auth_file.exists():
+            try:
+                key = (str(self.auth_file), self.auth_file.stat().st_mtime_ns)
+            except FileNotFoundError:
                 raise FileNotFoundError(f"Auth file not found: {self.auth_file}")
-                
-            with open(self.auth_file, 'r') as f:
-                cookies = json.load(f)
+            
+            # Reparse only when the file has changed
+            cached = _COOKIE_CACHE.get(key)
+            if cached is None:
+                cached = orjson.loads(self.auth_file.read_bytes())
+                if len(_COOKIE_CACHE) >= _COOKIE_CACHE_SIZE:
+                    del _COOKIE_CACHE[next(iter(_COOKIE_CACHE))]
+                _COOKIE_CACHE[key] = cached
+            
+            # Copy so callers can't modify the cached dict
+            cookies = dict(cached)
                 
             logger.info(f"vsauth: loaded {len(cookies)} cookies from {self.auth_file}")
             return cookies
@@ -99,33 +132,71 @@ class VSAuth:
             logger.error(f"vsauth: failed to load cookies: {e}")
             raise RuntimeError(f"Failed to load cookies: {e}")
     
-    def create_session(self) -> httpx.Client:
-        """Create an httpx client with loaded cookies.
+    def _session_options(self) -> Dict[str, Any]:
+        """Build the client options shared by sync and async sessions.
         
         Returns:
-            httpx.Client configured with Vista Social cookies
+            Keyword arguments for httpx.Client / httpx.AsyncClient
         """
         cookies = self.load_cookies()
         
-        # Create client with Vista Social UI headers
+        # Vista Social UI headers common to every API request; requests only
+        # add their endpoint-specific fields. No explicit Connection header:
+        # httpx keeps connections alive by default and HTTP/2 forbids it.
         headers = {
             'User-Agent': 'VistaSocialUI',
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.5',
+            # br and zstd are decodable via the httpx[brotli,zstd] extras
             'Accept-Encoding': 'gzip, deflate, br, zstd',
             'DNT': '1',
             'Sec-GPC': '1',
-            'Connection': 'keep-alive',
+            'Sec-Fetch-Dest': 'empty',
+            'Sec-Fetch-Mode': 'cors',
+            'Sec-Fetch-Site': 'same-origin',
+        }
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsauth: Loaded cookies: %s", list(cookies.keys()))
+            logger.debug("vsauth: Session headers: %s", headers)
+        return {
+            'headers': headers,
+            'cookies': cookies,
+            'follow_redirects': True,
+            'timeout': 30.0,
         }
+    
+    def create_session(self) -> httpx.Client:
+        """Create an httpx client with loaded cookies.
         
+        Returns:
+            httpx.Client configured with Vista Social cookies
+        """
+        # HTTP/2 multiplexes all requests over one connection and compresses
+        # repeated headers; keep idle connections around between commands
         client = httpx.Client(
-            headers=headers,
-            cookies=cookies,
-            follow_redirects=True,
-            timeout=30.0
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+            **self._session_options()
         )
         
         logger.info("vsauth: created session with browser-like headers")
-        logger.debug(f"vsauth: Loaded cookies: {list(cookies.keys())}")
-        logger.debug(f"vsauth: Session headers: {headers}")
-        return client 
\ No newline at end of file
+        return client
+    
+    def create_async_session(self) -> httpx.AsyncClient:
+        """Create an httpx async client with loaded cookies.
+        
+        The connection pool is sized for many concurrent requests, which
+        HTTP/2 multiplexes over a single connection where possible.
+        
+        Returns:
+            httpx.AsyncClient configured with Vista Social cookies
+        """
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            **self._session_options()
+        )
+        
+        logger.info("vsauth: created async session with browser-like headers")
+        return client
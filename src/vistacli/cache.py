@@ -0,0 +1,97 @@
+"""On-disk response cache for Vista Social API calls."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VSCache:
+    """Small TTL cache of API response bodies stored as JSON."""
+
+    # Entries older than this are pruned, even as stale fallbacks
+    MAX_AGE = 300
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """Initialize the cache.
+
+        Args:
+            cache_file: Path to cache file. Defaults to ~/.vscache
+        """
+        if cache_file is None:
+            cache_file = Path.home() / ".vscache"
+        self.cache_file = cache_file
+
+    @staticmethod
+    def make_key(namespace: str, *parts: Any) -> str:
+        """Build a cache key for an endpoint and its arguments.
+
+        Keys are prefixed with the namespace so all entries for an
+        endpoint can be invalidated together.
+        """
+        raw = "|".join("" if part is None else str(part) for part in parts)
+        digest = hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+        return f"{namespace}:{digest}"
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return the cached body for key, or None on a miss.
+
+        Args:
+            key: Cache key from make_key
+            allow_stale: Return the body even if its TTL has expired,
+                as long as it is younger than MAX_AGE
+        """
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+
+        age = time.time() - entry['ts']
+        if age > self.MAX_AGE or (not allow_stale and age > entry['ttl']):
+            return None
+
+        logger.debug("vscache: hit for %s", key)
+        return entry['body']
+
+    def set(self, key: str, body: Any, ttl: float) -> None:
+        """Store a body under key and prune expired entries."""
+        now = time.time()
+        entries = {
+            k: v for k, v in self._load().items()
+            if now - v['ts'] <= self.MAX_AGE
+        }
+        entries[key] = {'ts': now, 'ttl': ttl, 'body': body}
+        self._save(entries)
+
+    def invalidate(self, prefix: str) -> None:
+        """Drop every entry whose key starts with prefix."""
+        entries = self._load()
+        remaining = {k: v for k, v in entries.items() if not k.startswith(prefix)}
+        if len(remaining) != len(entries):
+            self._save(remaining)
+            logger.debug("vscache: invalidated %s entries for '%s'", len(entries) - len(remaining), prefix)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read all entries; a missing or unreadable cache is empty."""
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug("vscache: ignoring unreadable cache %s: %s", self.cache_file, e)
+            return {}
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Write all entries; failures only cost future cache hits."""
+        tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(entries, f)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.debug("vscache: failed to write cache %s: %s", self.cache_file, e)
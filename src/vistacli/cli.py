@@ -1,16 +1,19 @@
 """Command-line interface for Vista Social tools."""
 
-import csv
-import json
+import asyncio
 import logging
 import sys
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import click
 
-from .auth import VSAuth
-from .api import VSApi
-from .upload import VSUploader, SUPPORTED_EXTENSIONS
+# The API, auth and upload modules pull in httpx and browser_cookie3, so
+# commands import them on entry to keep --help and startup fast
+if TYPE_CHECKING:
+    from .auth import VSAuth
+
+# Maximum number of uploads or folder requests in flight at once
+REQUEST_CONCURRENCY = 8
 
 # Configure logging
 logging.basicConfig(
@@ -33,18 +36,29 @@ def cli(log_level: str):
 @click.option('--auth-file', 
               type=click.Path(path_type=str),
               help='Path to auth file (default: ~/.vsauth)')
+@click.option('--if-older-than', type=click.FloatRange(min=0), metavar='SECONDS',
+              help='Only extract cookies if the auth file is older than SECONDS')
 @click.option('--log-level', 
               type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR'], case_sensitive=False),
               default='WARNING',
               help='Set logging level')
-def vsauth(auth_file: Optional[str], log_level: str):
+def vsauth(auth_file: Optional[str], if_older_than: Optional[float], log_level: str):
     """Extract Vista Social cookies from Firefox and save them."""
     # Set logging level for this command
     logging.getLogger().setLevel(getattr(logging, log_level.upper()))
     
+    from .auth import VSAuth
+    
     try:
         auth = VSAuth(Path(auth_file) if auth_file else None)
         
+        # Skip the Firefox cookie database entirely if the saved cookies are fresh
+        if if_older_than is not None:
+            age = auth.auth_file_age()
+            if age is not None and age < if_older_than:
+                click.echo(f"Cookies in {auth.auth_file} are {age:.0f}s old, not extracting")
+                return
+        
         # Extract cookies from Firefox
         cookies = auth.extract_cookies()
         
@@ -83,27 +97,113 @@ def add(folder_name: str, description: str, labels: tuple, entity_gids: tuple, m
     # Set logging level for this command
     logging.getLogger().setLevel(getattr(logging, log_level.upper()))
     
+    from .api import VSApi
+    
     try:
-        auth = VSAuth(auth_file=Path(auth_file) if auth_file else None)
-        with VSApi(auth=auth) as api:
-            result = api.create_folder(
-                name=folder_name,
-                description=description,
-                labels=list(labels) if labels else None,
-                entity_gids=list(entity_gids) if entity_gids else None,
-                media_path=media_path
-            )
-            click.echo(f"Successfully created folder: {folder_name}")
+        api = VSApi.get_shared(auth_file=Path(auth_file) if auth_file else None)
+        result = api.create_folder(
+            name=folder_name,
+            description=description,
+            labels=list(labels) if labels else None,
+            entity_gids=list(entity_gids) if entity_gids else None,
+            media_path=media_path
+        )
+        click.echo(f"Successfully created folder: {folder_name}")
             
     except Exception as e:
         click.echo(f"Error creating folder: {e}", err=True)
         sys.exit(1)
 
 
+@vsdir.command(name='add-many')
+@click.option('--from-file', '-f', 'from_file', type=click.File('r'), required=True,
+              help='File with one folder per line as title[,description[,labels]], labels separated by ";" (- for stdin)')
+@click.option('--entity-gids', '-e', multiple=True, help='Entity GIDs for every folder (can specify multiple)')
+@click.option('--media-path', '-m', help='Parent folder ID for creating subfolders')
+@click.option('--auth-file', 
+              type=click.Path(path_type=str),
+              help='Path to auth file (default: ~/.vsauth)')
+@click.option('--log-level', 
+              type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR'], case_sensitive=False),
+              default='WARNING',
+              help='Set logging level')
+def add_many(from_file, entity_gids: tuple, media_path: Optional[str], auth_file: Optional[str], log_level: str):
+    """Add many folders concurrently from a file."""
+    # Set logging level for this command
+    logging.getLogger().setLevel(getattr(logging, log_level.upper()))
+    
+    from .auth import VSAuth
+    
+    try:
+        rows = _read_folder_rows(from_file)
+        if not rows:
+            click.echo("No folders to create", err=True)
+            sys.exit(1)
+        
+        for row in rows:
+            row['entity_gids'] = list(entity_gids) if entity_gids else None
+            row['media_path'] = media_path
+        
+        auth = VSAuth(auth_file=Path(auth_file) if auth_file else None)
+        results = asyncio.run(_create_all(auth, rows))
+        
+        failed = 0
+        for row, result in zip(rows, results):
+            if isinstance(result, Exception):
+                click.echo(f"Error creating folder {row['name']}: {result}", err=True)
+                failed += 1
+            else:
+                click.echo(f"Successfully created folder: {row['name']}")
+        
+        # Summary
+        if failed:
+            click.echo(f"Failed to create {failed} of {len(rows)} folder(s)", err=True)
+            sys.exit(1)
+            
+    except Exception as e:
+        click.echo(f"Error creating folders: {e}", err=True)
+        sys.exit(1)
+
+
+def _read_folder_rows(lines) -> list:
+    """Parse title[,description[,labels]] lines into create_folder arguments."""
+    import csv
+    
+    rows = []
+    for fields in csv.reader(lines):
+        if not fields or not fields[0].strip():
+            continue
+        
+        labels = fields[2].split(';') if len(fields) > 2 else []
+        rows.append({
+            'name': fields[0].strip(),
+            'description': fields[1].strip() if len(fields) > 1 else '',
+            'labels': [label.strip() for label in labels if label.strip()] or None,
+        })
+    return rows
+
+
+async def _create_all(auth: 'VSAuth', rows: list) -> list:
+    """Create folders concurrently on one session, returning a result or exception per row."""
+    from .api import AsyncVSApi
+    
+    # Cap in-flight requests to stay polite to the API
+    semaphore = asyncio.Semaphore(REQUEST_CONCURRENCY)
+    
+    async with AsyncVSApi(auth=auth) as api:
+        async def create(row: dict):
+            async with semaphore:
+                return await api.create_folder(**row)
+        
+        tasks = [create(row) for row in rows]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
 @vsdir.command(name='list')
 @click.option('--json', '-j', 'json_output', is_flag=True, help='Output in JSON format')
 @click.option('--csv', '-c', 'csv_output', is_flag=True, help='Output in CSV format')
 @click.option('--media-path', '-m', help='Parent folder ID for subfolder listing')
+@click.option('--no-cache', is_flag=True, help='Always fetch folders from Vista Social instead of the local cache')
 @click.option('--auth-file', 
               type=click.Path(path_type=str),
               help='Path to auth file (default: ~/.vsauth)')
@@ -111,34 +211,42 @@ def add(folder_name: str, description: str, labels: tuple, entity_gids: tuple, m
               type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR'], case_sensitive=False),
               default='WARNING',
               help='Set logging level')
-def list_folders(json_output: bool, csv_output: bool, media_path: Optional[str], auth_file: Optional[str], log_level: str):
+def list_folders(json_output: bool, csv_output: bool, media_path: Optional[str], no_cache: bool, auth_file: Optional[str], log_level: str):
     """List folders."""
     # Set logging level for this command
     logging.getLogger().setLevel(getattr(logging, log_level.upper()))
     
+    import csv
+    import io
+    
+    import orjson
+    
+    from .api import VSApi
+    
     try:
-        auth = VSAuth(auth_file=Path(auth_file) if auth_file else None)
-        with VSApi(auth=auth) as api:
-            folders = api.get_folders(media_path=media_path)
-            
-            if json_output:
-                # Output full JSON response
-                click.echo(json.dumps(folders, indent=2))
-            elif csv_output:
-                # Output CSV format: title,id,created_at
-                writer = csv.writer(sys.stdout)
-                for folder in folders:
-                    writer.writerow([
-                        folder.get('title', ''),
-                        folder.get('id', ''),
-                        folder.get('created_at', '')
-                    ])
-            else:
-                # Output just titles, lexically sorted
-                titles = sorted([folder.get('title', '') for folder in folders])
-                for title in titles:
-                    click.echo(title)
-                    
+        api = VSApi.get_shared(auth_file=Path(auth_file) if auth_file else None, use_cache=not no_cache)
+        folders = api.get_folders(media_path=media_path)
+        
+        if json_output:
+            # Output full JSON response
+            click.get_binary_stream('stdout').write(
+                orjson.dumps(folders, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+            )
+        elif csv_output:
+            # Output CSV format: title,id,created_at, written in one go
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(
+                (folder.get('title', ''), folder.get('id', ''), folder.get('created_at', ''))
+                for folder in folders
+            )
+            sys.stdout.write(buffer.getvalue())
+        else:
+            # Output just titles, lexically sorted
+            titles = sorted([folder.get('title', '') for folder in folders])
+            if titles:
+                click.echo('\n'.join(titles))
+                
     except Exception as e:
         click.echo(f"Error listing folders: {e}", err=True)
         sys.exit(1)
@@ -161,11 +269,12 @@ def delete(folder_id: str, auth_file: Optional[str], log_level: str):
     # Set logging level for this command
     logging.getLogger().setLevel(getattr(logging, log_level.upper()))
     
+    from .api import VSApi
+    
     try:
-        auth = VSAuth(auth_file=Path(auth_file) if auth_file else None)
-        with VSApi(auth=auth) as api:
-            api.delete_folder(folder_id)
-            click.echo(f"Successfully deleted folder: {folder_id}")
+        api = VSApi.get_shared(auth_file=Path(auth_file) if auth_file else None)
+        api.delete_folder(folder_id)
+        click.echo(f"Successfully deleted folder: {folder_id}")
             
     except Exception as e:
         click.echo(f"Error deleting folder: {e}", err=True)
@@ -177,8 +286,10 @@ from pathlib import Path
 
 
 @cli.command()
-@click.argument('file_paths', nargs=-1, type=click.Path(exists=True, path_type=str), required=True)
+@click.argument('file_paths', nargs=-1, type=click.Path(exists=True, path_type=str))
 @click.option('--subfolder', '-s', help='Subfolder ID to place the uploaded asset in')
+@click.option('--resume', 'resume_ids', multiple=True, metavar='MEDIA_GID',
+              help='Resume an interrupted upload by its media GID (can be used multiple times)')
 @click.option('--auth-file', 
               type=click.Path(path_type=str),
               help='Path to auth file (default: ~/.vsauth)')
@@ -186,28 +297,64 @@ from pathlib import Path
               type=click.Choice(['DEBUG', 'INFO', 'WARNING', 'ERROR'], case_sensitive=False),
               default='WARNING',
               help='Set logging level')
-def vsput(file_paths: tuple, subfolder: Optional[str], auth_file: Optional[str], log_level: str):
+def vsput(file_paths: tuple, subfolder: Optional[str], resume_ids: tuple, auth_file: Optional[str], log_level: str):
     """Upload files to Vista Social media library."""
+    if not file_paths and not resume_ids:
+        raise click.UsageError("Give at least one file to upload or --resume MEDIA_GID")
+    
     # Set logging level for this command
     logging.getLogger().setLevel(getattr(logging, log_level.upper()))
     
+    from .auth import VSAuth
+    from .upload import VSUploader, SUPPORTED_EXTENSIONS
+    
     try:
         # Initialize auth and uploader
         auth = VSAuth(auth_file=Path(auth_file) if auth_file else None)
-        uploader = VSUploader(auth)
+        with VSUploader(auth) as uploader:
+            # Resumed uploads keep the subfolder they were started with
+            resumed = []
+            for media_gid in resume_ids:
+                try:
+                    resumed.append((media_gid, uploader.resume(media_gid)))
+                except Exception as e:
+                    resumed.append((media_gid, e))
+            
+            # Upload all files concurrently
+            results = []
+            if file_paths:
+                results = asyncio.run(uploader.upload_files(file_paths, subfolder, concurrency=REQUEST_CONCURRENCY))
+            
+            # Drop sessions from failed uploads that were never resumed
+            uploader.sessions.prune()
         
         # Track results
         successful_uploads = []
         failed_uploads = []
         
-        # Upload each file
-        for file_path in file_paths:
-            try:
-                # Upload the file
-                result = uploader.upload_file(file_path, subfolder)
-                
+        for media_gid, result in resumed:
+            if isinstance(result, Exception):
+                click.echo(f"Error resuming upload {media_gid}: {result}", err=True)
+                failed_uploads.append(media_gid)
+            else:
+                click.echo(f"Successfully resumed upload: {media_gid}")
+                successful_uploads.append(media_gid)
+        
+        for file_path, result in zip(file_paths, results):
+            file_name = Path(file_path).name
+            
+            if isinstance(result, ValueError):
+                click.echo(f"Validation error for {file_name}: {result}", err=True)
+                click.echo(f"Supported file types: {', '.join(sorted(SUPPORTED_EXTENSIONS))}", err=True)
+                failed_uploads.append(file_path)
+            elif isinstance(result, FileNotFoundError):
+                click.echo(f"File not found: {file_name} - {result}", err=True)
+                failed_uploads.append(file_path)
+            elif isinstance(result, Exception):
+                click.echo(f"Error uploading {file_name}: {result}", err=True)
+                failed_uploads.append(file_path)
+            else:
                 # Output success message with file info
-                file_name = Path(file_path).name
                 click.echo(f"Successfully uploaded: {file_name}")
                 
                 # In debug mode, show more details
@@ -216,20 +363,6 @@ def vsput(file_paths: tuple, subfolder: Optional[str], auth_file: Optional[str],
                     click.echo(f"Temp ID: {result.get('tempId', 'N/A')}")
                 
                 successful_uploads.append(file_path)
-                
-            except ValueError as e:
-                file_name = Path(file_path).name
-                click.echo(f"Validation error for {file_name}: {e}", err=True)
-                click.echo(f"Supported file types: {', '.join(SUPPORTED_EXTENSIONS)}", err=True)
-                failed_uploads.append(file_path)
-            except FileNotFoundError as e:
-                file_name = Path(file_path).name
-                click.echo(f"File not found: {file_name} - {e}", err=True)
-                failed_uploads.append(file_path)
-            except Exception as e:
-                file_name = Path(file_path).name
-                click.echo(f"Error uploading {file_name}: {e}", err=True)
-                failed_uploads.append(file_path)
         
         # Summary
         if successful_uploads:
@@ -240,4 +373,4 @@ def vsput(file_paths: tuple, subfolder: Optional[str], auth_file: Optional[str],
             
     except Exception as e:
         click.echo(f"Error initializing uploader: {e}", err=True)
-        sys.exit(1) 
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,97 @@
+"""On-disk state for resuming interrupted uploads."""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upload stages in order; a session records the last one completed
+STAGE_STARTED = 'started'
+STAGE_UPLOADED = 'uploaded'
+STAGE_FINISHED = 'finished'
+
+# Sessions not resumed within this many seconds are removed by prune
+SESSION_MAX_AGE = 7 * 24 * 60 * 60
+
+
+class VSUploadSessions:
+    """Upload session files, one JSON file per media GID.
+
+    Sessions are keyed on the server-assigned media GID, which is unique,
+    unlike the client-generated temp ID.
+    """
+
+    def __init__(self, sessions_dir: Optional[Path] = None):
+        """Initialize the session store.
+
+        Args:
+            sessions_dir: Directory for session files. Defaults to
+                ~/.cache/vistacli/sessions
+        """
+        if sessions_dir is None:
+            sessions_dir = Path.home() / ".cache" / "vistacli" / "sessions"
+        self.sessions_dir = sessions_dir
+
+    def _path(self, media_gid: str) -> Path:
+        return self.sessions_dir / f"{media_gid}.json"
+
+    def load(self, media_gid: str) -> Dict[str, Any]:
+        """Read the session for media_gid.
+
+        Raises:
+            FileNotFoundError: If there is no session for media_gid
+        """
+        try:
+            with open(self._path(media_gid), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No upload session found for media GID {media_gid}") from None
+
+    def save(self, session: Dict[str, Any]) -> None:
+        """Write a session; failures only cost the ability to resume it."""
+        path = self._path(session['media_gid'])
+        tmp_file = None
+        try:
+            self.sessions_dir.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per write, so concurrent saves never share one
+            fd, tmp_file = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=self.sessions_dir)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(session, f)
+            os.replace(tmp_file, path)
+        except OSError as e:
+            logger.debug("vsput: failed to write upload session %s: %s", path, e)
+            if tmp_file is not None:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+
+    def delete(self, media_gid: str) -> None:
+        """Remove a completed session."""
+        try:
+            self._path(media_gid).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug("vsput: failed to remove upload session %s: %s", media_gid, e)
+
+    def prune(self, max_age: float = SESSION_MAX_AGE) -> None:
+        """Remove sessions last saved more than max_age seconds ago."""
+        cutoff = time.time() - max_age
+        try:
+            paths = list(self.sessions_dir.glob("*.json"))
+        except OSError:
+            return
+
+        for path in paths:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    logger.debug("vsput: removed abandoned upload session %s", path.stem)
+            except OSError as e:
+                logger.debug("vsput: failed to prune upload session %s: %s", path, e)
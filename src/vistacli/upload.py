@@ -1,20 +1,29 @@
 """
 Upload functionality for Vista Social media library.
 """
+import asyncio
+import hashlib
 import logging
-import mimetypes
 import os
 import random
+import stat
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import BinaryIO, Callable, Dict, Any, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar, Union
+from urllib.parse import urlparse
 
 import httpx
+import orjson
 
 from .auth import VSAuth
+from .sessions import STAGE_FINISHED, STAGE_STARTED, STAGE_UPLOADED, VSUploadSessions
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 # Supported image types for Vista Social
 SUPPORTED_IMAGE_TYPES = {
     'image/jpeg': ['.jpg', '.jpeg'],
@@ -26,15 +35,148 @@ SUPPORTED_IMAGE_TYPES = {
     'image/svg+xml': ['.svg']
 }
 
-SUPPORTED_EXTENSIONS = [ext for extensions in SUPPORTED_IMAGE_TYPES.values() for ext in extensions]
+# Extension -> MIME type, so validation is a single lookup
+EXT_TO_MIME = {ext: mime_type for mime_type, extensions in SUPPORTED_IMAGE_TYPES.items() for ext in extensions}
+
+SUPPORTED_EXTENSIONS = frozenset(EXT_TO_MIME)
+
+# Size of the reads used to stream file bodies to S3
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Attempts per file before upload_files gives up on transient errors
+UPLOAD_ATTEMPTS = 3
+
+# Headers every step sends, as the browser does. Requests to the Vista
+# Social API get the same values from the session defaults (see
+# VSAuth.create_session); S3 and CloudFront requests go through the
+# anonymous client, so they need them spelled out.
+_COMMON = MappingProxyType({
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br, zstd',
+    'DNT': '1',
+    'Sec-GPC': '1',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors'
+})
+
+
+def _h(*bases: Mapping[str, str], **overrides: str) -> Dict[str, str]:
+    """Build a header dict from _COMMON, then any base mappings, then overrides."""
+    headers = dict(_COMMON)
+    for base in bases:
+        headers.update(base)
+    headers.update(overrides)
+    return headers
+
+
+# Per-step header templates, built once at import. Origin and Referer depend
+# on the API base URL and are filled in by VSUploader.
+_API_HEADERS_TMPL = MappingProxyType(_h(
+    {'Content-Type': 'application/json', 'Sec-Fetch-Site': 'same-origin'},
+    Priority='u=4'
+))
+
+_START_HEADERS_TMPL = MappingProxyType(_h(_API_HEADERS_TMPL, TE='trailers'))
+
+_S3_PUT_HEADERS_TMPL = MappingProxyType(_h({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:141.0) Gecko/20100101 Firefox/141.0',
+    'Accept': '*/*',
+    'Sec-Fetch-Site': 'cross-site',
+    'Content-Disposition': 'inline'
+}))
+
+_CLOUDFRONT_HEADERS_TMPL = MappingProxyType(_h(
+    {k: v for k, v in _S3_PUT_HEADERS_TMPL.items() if k != 'Content-Disposition'},
+    Priority='u=4'
+))
+
+_PREFLIGHT_HEADERS_TMPL = MappingProxyType(_h(_CLOUDFRONT_HEADERS_TMPL, {
+    'Access-Control-Request-Method': 'PUT',
+    'Access-Control-Request-Headers': 'content-disposition,content-type'
+}))
+
+
+def _env_flag(name: str) -> bool:
+    """Read an on/off environment variable; only 1, true, yes and on enable it."""
+    return os.getenv(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Whether an error may succeed on retry: network errors and 5xx responses."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _iter_file_chunks(f: BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in fixed-size chunks."""
+    chunk = f.read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = f.read(chunk_size)
+
+
+def _file_sha256(file_path: Path) -> str:
+    """Hash a file's contents without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in _iter_file_chunks(f):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class VSUploader:
     """Handles file uploads to Vista Social media library."""
     
-    def __init__(self, auth: VSAuth):
+    def __init__(self, auth: VSAuth, sessions: Optional[VSUploadSessions] = None):
         self.auth = auth
         self.client = auth.create_session()
+        # Progress of each upload is saved so interrupted ones can resume
+        self.sessions = sessions if sessions is not None else VSUploadSessions()
+        # Cookie-less client for S3 and CloudFront, kept open so uploads
+        # reuse its connections instead of reconnecting for every step.
+        # HTTP/2 is negotiated per host and falls back to HTTP/1.1. The
+        # long keep-alive holds both hosts' connections across a batch, and
+        # failed connection attempts are retried by the transport.
+        self._anon_client = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60.0),
+                retries=2
+            )
+        )
+        # CORS preflight is only enforced by browsers, so it is opt-in, and
+        # sent at most once per S3 origin
+        self._send_preflight = _env_flag('VSUPLOAD_SEND_PREFLIGHT')
+        self._preflighted: Set[str] = set()
+        # Sending the body's SHA-256 lets S3 verify it, but headers go out
+        # before the body, so it costs an extra read of each file; opt-in
+        self._send_content_sha256 = _env_flag('VSUPLOAD_SEND_CONTENT_SHA256')
+        
+        # Complete the header templates once; requests only copy them
+        # when a per-file value (subfolder, content type) is needed
+        base_url = auth.BASE_URL
+        self._referer_media = f'{base_url}/media'
+        api_fields = {'Origin': base_url, 'Referer': self._referer_media}
+        cross_site_fields = {'Origin': base_url, 'Referer': f'{base_url}/'}
+        self._start_headers = {**_START_HEADERS_TMPL, **api_fields}
+        self._api_headers = {**_API_HEADERS_TMPL, **api_fields}
+        self._s3_headers = {**_S3_PUT_HEADERS_TMPL, **cross_site_fields}
+        self._preflight_headers = {**_PREFLIGHT_HEADERS_TMPL, **cross_site_fields}
+        self._cloudfront_headers = {**_CLOUDFRONT_HEADERS_TMPL, **cross_site_fields}
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+    
+    def close(self) -> None:
+        """Close the API session and the S3/CloudFront client."""
+        self.client.close()
+        self._anon_client.close()
     
     def upload_file(self, file_path: str, subfolder: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -52,69 +194,371 @@ class VSUploader:
             FileNotFoundError: If file doesn't exist
             httpx.HTTPStatusError: If upload fails
         """
+        session = self._begin_upload(file_path, subfolder)
+        try:
+            result, batch_item = self._continue_upload(session)
+            
+            # Step 6: Batch update to associate file with folder and metadata
+            self._batch_update([batch_item], subfolder)
+        except Exception as e:
+            self._keep_if_resumable(session, e)
+            raise
+        
+        self.sessions.delete(session['media_gid'])
+        logger.info("vsput: Successfully uploaded %s", file_path)
+        return result
+    
+    def resume(self, media_gid: str) -> Dict[str, Any]:
+        """
+        Resume an interrupted upload after its last completed step.
+        
+        Args:
+            media_gid: Media GID of the upload, as logged when it failed
+            
+        Returns:
+            Dict containing upload result information
+            
+        Raises:
+            FileNotFoundError: If there is no session for media_gid, or the
+                file is gone before it reached S3
+            ValueError: If the file changed size before it reached S3
+            httpx.HTTPStatusError: If upload fails
+        """
+        session = self.sessions.load(media_gid)
+        file_path = session['file_path']
+        logger.debug("vsput: Resuming upload of %s after stage '%s'", file_path, session['stage'])
+        
+        try:
+            # The size was declared when the upload started, so the file has
+            # to match it if it still needs sending to S3
+            if session['stage'] == STAGE_STARTED and os.stat(file_path).st_size != session['size']:
+                raise ValueError(f"File changed since its upload started: {file_path}")
+            
+            result, batch_item = self._continue_upload(session)
+            self._batch_update([batch_item], session['subfolder'])
+        except Exception as e:
+            self._keep_if_resumable(session, e)
+            raise
+        
+        self.sessions.delete(media_gid)
+        logger.info("vsput: Successfully uploaded %s", file_path)
+        return result
+    
+    def _begin_upload(self, file_path: str, subfolder: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Validate a file and run step 1, saving the new upload session.
+        
+        Returns:
+            The session, which _continue_upload takes through steps 2-5
+        """
         file_path = Path(file_path)
         
-        # Validate file exists
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        # Validate file exists, with a single stat for every check
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
         
-        if not file_path.is_file():
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Not a file: {file_path}")
         
         # Validate file type
-        self._validate_file_type(file_path)
+        mime_type = self._validate_file_type(file_path)
+        file_size = st.st_size
         
         # Generate temp ID (random number for now)
         temp_id = self._generate_temp_id()
         
-        logger.debug(f"vsput: Starting upload for {file_path} with temp_id {temp_id}")
+        logger.debug("vsput: Starting upload for %s with temp_id %s", file_path, temp_id)
         
         # Step 1: Start upload
-        upload_info = self._start_upload(file_path, temp_id, subfolder)
+        upload_info = self._start_upload(file_path, temp_id, mime_type, file_size, subfolder)
+        
+        session = {
+            'temp_id': temp_id,
+            'media_gid': upload_info['media_gid'],
+            'upload_url': upload_info['upload_url'],
+            'meta_url': upload_info.get('meta_url'),
+            'file_path': str(file_path.resolve()),
+            'mime_type': mime_type,
+            'size': file_size,
+            'subfolder': subfolder,
+            'sha256': None,
+            'result': None,
+            'stage': STAGE_STARTED
+        }
+        self.sessions.save(session)
+        return session
+    
+    def _continue_upload(self, session: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Run steps 2-5 of an upload, skipping those the session has completed.
         
-        # Step 2: Upload file to S3
-        self._upload_to_s3(file_path, upload_info['upload_url'])
+        The session is saved after each step, so a failed upload can be
+        retried or resumed without repeating the S3 upload.
         
-        # Step 3: OPTIONS request (CORS preflight)
-        self._options_request(upload_info['upload_url'])
+        Returns:
+            The finish-upload result and the file's batch update item
+        """
+        upload_url = session['upload_url']
+        
+        if session['stage'] == STAGE_STARTED:
+            file_path = Path(session['file_path'])
+            # The hash is kept from the first attempt, so S3 rejects a retry
+            # or resume whose file has changed since
+            if self._send_content_sha256 and not session['sha256']:
+                session['sha256'] = _file_sha256(file_path)
+                self.sessions.save(session)
+            
+            # Step 2: Upload file to S3
+            self._upload_to_s3(file_path, upload_url, session['mime_type'], session['size'], session['sha256'])
+            self._advance(session, STAGE_UPLOADED)
+            
+            # Step 3: OPTIONS request (CORS preflight), only if enabled
+            if self._send_preflight:
+                self._options_request(upload_url)
+        
+        if session['stage'] == STAGE_UPLOADED:
+            # Step 4: Finish upload
+            session['result'] = self._finish_upload(session['temp_id'], session['media_gid'])
+            self._advance(session, STAGE_FINISHED)
+        
+        # Step 5: Fetch metadata from CloudFront (optional but completes the flow).
+        # Images need it too: the batch update carries their width, height
+        # and aspect ratio
+        metadata = None
+        if session['meta_url']:
+            metadata = self._fetch_metadata(session['meta_url'])
         
-        # Step 4: Finish upload
-        result = self._finish_upload(temp_id, upload_info['media_gid'])
+        return session['result'], self._batch_item(session['media_gid'], metadata, session['subfolder'])
+    
+    def _advance(self, session: Dict[str, Any], stage: str) -> None:
+        """Record that an upload completed a stage."""
+        session['stage'] = stage
+        self.sessions.save(session)
+    
+    def _keep_if_resumable(self, session: Dict[str, Any], error: Exception) -> None:
+        """
+        Keep a failed upload's session if resuming it can succeed.
         
-        # Step 5: Fetch metadata from CloudFront (optional but completes the flow)
-        metadata = None
-        if 'meta_url' in upload_info:
-            metadata = self._fetch_metadata(upload_info['meta_url'])
+        Once the file is on S3 the remaining steps can always be retried.
+        Before that, only transient errors are worth resuming: a permanent
+        one, such as S3 rejecting an expired presigned URL, would fail the
+        same way again, so its session is removed.
+        """
+        if session['stage'] != STAGE_STARTED or _is_transient(error):
+            logger.warning("vsput: upload of %s can be resumed with --resume %s", session['file_path'], session['media_gid'])
+        else:
+            self.sessions.delete(session['media_gid'])
+    
+    async def upload_file_async(self, file_path: str, subfolder: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload a file without blocking the event loop.
         
-        # Step 6: Batch update to associate file with folder and metadata
-        self._batch_update(upload_info['media_gid'], metadata, subfolder)
+        This is upload_files for a single file, so it gets the same retries
+        and resumable session, but raises instead of returning the error.
         
-        logger.info(f"vsput: Successfully uploaded {file_path}")
+        Args:
+            file_path: Path to the file to upload
+            subfolder: Optional subfolder ID to place the uploaded asset in
+            
+        Returns:
+            Dict containing upload result information
+        """
+        result = (await self.upload_files([file_path], subfolder, concurrency=1))[0]
+        if isinstance(result, Exception):
+            raise result
         return result
     
-    def _validate_file_type(self, file_path: Path) -> None:
-        """Validate that the file type is supported."""
-        # Check file extension
-        extension = file_path.suffix.lower()
-        if extension not in SUPPORTED_EXTENSIONS:
-            raise ValueError(f"Unsupported file extension: {extension}. Supported: {', '.join(SUPPORTED_EXTENSIONS)}")
+    async def upload_files(self, file_paths: Sequence[str], subfolder: Optional[str] = None, concurrency: int = 8) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Upload many files concurrently.
+        
+        Uploads are pipelined. Starter tasks run step 1 for queued files
+        back to back and hand the sessions to up to `concurrency` upload
+        workers, which run the S3 upload and the remaining steps. A file's
+        upload is then started while other files are still sending to S3.
+        Each step runs in its own thread over the shared, pooled sessions.
+        Transient failures (network errors and 5xx responses) are retried
+        with exponential backoff without holding up the other workers. All
+        uploaded files are then associated with the folder in a single
+        batch update.
+        
+        Args:
+            file_paths: Paths of the files to upload
+            subfolder: Optional subfolder ID to place the uploaded assets in
+            concurrency: Maximum number of S3 uploads in flight at once
+            
+        Returns:
+            For each file, in order, its upload result or the exception
+            that made it fail
+            
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        file_q: asyncio.Queue = asyncio.Queue()
+        for index, file_path in enumerate(file_paths):
+            file_q.put_nowait((index, file_path))
+        
+        # Started uploads wait here for a worker; the bound keeps step 1 only
+        # a little ahead of the S3 uploads so presigned URLs stay fresh
+        start_q: asyncio.Queue = asyncio.Queue(maxsize=max(1, concurrency))
+        # Uploads through step 5, waiting for the batch update
+        finish_q: asyncio.Queue = asyncio.Queue()
+        
+        results: List[Union[Dict[str, Any], Exception]] = [None] * len(file_paths)
+        sessions: Dict[int, Dict[str, Any]] = {}
+        loop = asyncio.get_running_loop()
+        
+        uploaders = min(concurrency, len(file_paths))
+        starters = max(1, uploaders // 2)
+        
+        # Not a with block: its exit waits for running threads, which would
+        # block the event loop until every in-flight PUT ends on cancellation
+        executor = ThreadPoolExecutor(max_workers=max(1, uploaders + starters))
+        try:
+            async def starter():
+                while True:
+                    try:
+                        index, file_path = file_q.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    
+                    try:
+                        sessions[index] = await self._with_retries(
+                            loop, executor, f"upload of {file_path}", self._begin_upload, file_path, subfolder
+                        )
+                    except Exception as e:
+                        results[index] = e
+                    else:
+                        await start_q.put((index, file_path))
+            
+            async def start_all():
+                await asyncio.gather(*(starter() for _ in range(starters)))
+                # One stop marker per worker, queued behind the last upload
+                for _ in range(uploaders):
+                    await start_q.put(None)
+            
+            async def worker():
+                while True:
+                    item = await start_q.get()
+                    if item is None:
+                        return
+                    
+                    index, file_path = item
+                    try:
+                        # Retries pick up from the last step the session completed
+                        results[index], batch_item = await self._with_retries(
+                            loop, executor, f"upload of {file_path}", self._continue_upload, sessions[index]
+                        )
+                    except Exception as e:
+                        results[index] = e
+                        self._keep_if_resumable(sessions[index], e)
+                    else:
+                        finish_q.put_nowait((index, batch_item))
+            
+            await asyncio.gather(start_all(), *(worker() for _ in range(uploaders)))
+            
+            batch_items: Dict[int, Dict[str, Any]] = {}
+            while not finish_q.empty():
+                index, batch_item = finish_q.get_nowait()
+                batch_items[index] = batch_item
+            
+            # Step 6 for every uploaded file at once, in upload order
+            failures = await self._batch_update_all(loop, executor, batch_items, subfolder)
+            for index in batch_items:
+                if index in failures:
+                    # The file reached S3 but wasn't associated
+                    results[index] = failures[index]
+                    self._keep_if_resumable(sessions[index], failures[index])
+                else:
+                    self.sessions.delete(sessions[index]['media_gid'])
+                    logger.info("vsput: Successfully uploaded %s", file_paths[index])
+        finally:
+            executor.shutdown(wait=False)
+        
+        return results
+    
+    async def _batch_update_all(self, loop: asyncio.AbstractEventLoop, executor: Executor, batch_items: Dict[int, Dict[str, Any]], subfolder: Optional[str]) -> Dict[int, Exception]:
+        """
+        Run step 6 for many files in one request, falling back to one
+        request per file if that fails, so one bad item can't fail them all.
         
-        # Check MIME type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type or mime_type not in SUPPORTED_IMAGE_TYPES:
-            raise ValueError(f"Unsupported MIME type: {mime_type}. Supported: {', '.join(SUPPORTED_IMAGE_TYPES.keys())}")
+        Args:
+            batch_items: Batch update item for each file, by file index
+            
+        Returns:
+            The error for each file that could not be updated
+        """
+        if not batch_items:
+            return {}
+        
+        indexes = sorted(batch_items)
+        try:
+            await self._with_retries(
+                loop, executor, "batch update", self._batch_update, [batch_items[index] for index in indexes], subfolder
+            )
+            return {}
+        except Exception as e:
+            if len(indexes) == 1:
+                return {indexes[0]: e}
+            logger.warning("vsput: batch update of %s files failed (%s), updating them one at a time", len(indexes), e)
+        
+        async def update_one(index: int) -> Optional[Exception]:
+            item = batch_items[index]
+            try:
+                await self._with_retries(
+                    loop, executor, f"batch update of {item['media_gid']}", self._batch_update, [item], subfolder
+                )
+            except Exception as e:
+                return e
+            return None
+        
+        errors = await asyncio.gather(*(update_one(index) for index in indexes))
+        return {index: error for index, error in zip(indexes, errors) if error is not None}
+    
+    async def _with_retries(self, loop: asyncio.AbstractEventLoop, executor: Executor, description: str, func: Callable[..., T], *args: Any) -> T:
+        """Run func in executor, retrying transient failures with exponential backoff."""
+        for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+            try:
+                return await loop.run_in_executor(executor, func, *args)
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if not _is_transient(e) or attempt == UPLOAD_ATTEMPTS:
+                    raise
+                
+                delay = 2 ** (attempt - 1)
+                logger.warning("vsput: %s failed (%s), retrying in %ss", description, e, delay)
+                await asyncio.sleep(delay)
+    
+    def _validate_file_type(self, file_path: Path) -> str:
+        """Validate that the file type is supported and return its MIME type."""
+        # The extension determines the MIME type
+        extension = file_path.suffix.lower()
+        mime_type = EXT_TO_MIME.get(extension)
+        if mime_type is None:
+            raise ValueError(f"Unsupported file extension: {extension}. Supported: {', '.join(sorted(SUPPORTED_EXTENSIONS))}")
         
-        logger.debug(f"vsput: Validated file type: {mime_type} ({extension})")
+        logger.debug("vsput: Validated file type: %s (%s)", mime_type, extension)
+        return mime_type
+    
+    def _with_subfolder_referer(self, headers: Dict[str, str], subfolder: Optional[str]) -> Dict[str, str]:
+        """Point the Referer at the subfolder's media page, as the UI does."""
+        if not subfolder:
+            return headers
+        return {**headers, 'Referer': f'{self._referer_media}/{subfolder}'}
     
     def _generate_temp_id(self) -> str:
         """Generate a temporary ID for the upload."""
         # For now, use current timestamp + random number
         # This can be refined based on actual Vista Social requirements
-        timestamp = int(time.time() * 1000)
-        random_num = random.randint(1000, 9999)
+        timestamp = time.time_ns() // 1_000_000
+        random_num = random.getrandbits(14)
         return str(timestamp + random_num)
     
-    def _start_upload(self, file_path: Path, temp_id: str, subfolder: Optional[str] = None) -> Dict[str, Any]:
+    def _start_upload(self, file_path: Path, temp_id: str, mime_type: str, file_size: int, subfolder: Optional[str] = None) -> Dict[str, Any]:
         """Step 1: Start the upload process."""
         url = f"{self.auth.BASE_URL}/api/publishing/media/upload/start"
         
@@ -123,31 +567,9 @@ class VSUploader:
             'replacement_type': ''
         }
         
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'{self.auth.BASE_URL}/media/{subfolder}' if subfolder else f'{self.auth.BASE_URL}/media',
-            'Content-Type': 'application/json',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=4',
-            'TE': 'trailers'
-        }
-        
-        # Don't duplicate headers - the client already has them
+        headers = self._with_subfolder_referer(self._start_headers, subfolder)
         
         # Build request body with file metadata
-        file_size = file_path.stat().st_size
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type:
-            mime_type = 'application/octet-stream'
-            
         request_body = {
             "name": file_path.name,
             "mimetype": mime_type,
@@ -155,89 +577,71 @@ class VSUploader:
             "hibernated": True
         }
         
-        logger.debug(f"vsput: POST {url}")
-        logger.debug(f"vsput: Headers: {headers}")
-        logger.debug(f"vsput: Params: {params}")
-        logger.debug(f"vsput: Request body: {request_body}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: POST %s", url)
+            logger.debug("vsput: Headers: %s", headers)
+            logger.debug("vsput: Params: %s", params)
+            logger.debug("vsput: Request body: %s", request_body)
         
         response = self.client.post(url, params=params, headers=headers, json=request_body)
         response.raise_for_status()
         
-        data = response.json()
-        logger.debug(f"vsput: Response status: {response.status_code}")
-        logger.debug(f"vsput: Response headers: {dict(response.headers)}")
-        logger.debug(f"vsput: Response body: {data}")
+        data = orjson.loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: Response status: %s", response.status_code)
+            logger.debug("vsput: Response headers: %s", response.headers)
+            logger.debug("vsput: Response body: %s", data)
         
         return data
     
-    def _upload_to_s3(self, file_path: Path, upload_url: str) -> None:
-        """Step 2: Upload file to S3."""
-        logger.debug(f"vsput: Uploading {file_path} to S3")
-        
-        # Read file content
-        with open(file_path, 'rb') as f:
-            file_content = f.read()
+    def _upload_to_s3(self, file_path: Path, upload_url: str, mime_type: str, file_size: int, content_sha256: Optional[str] = None) -> None:
+        """
+        Step 2: Upload file to S3.
         
-        # Determine content type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if not mime_type:
-            mime_type = 'application/octet-stream'
+        If content_sha256 is given it is sent as X-Amz-Content-Sha256, so S3
+        rejects a body that doesn't match.
+        """
+        logger.debug("vsput: Uploading %s to S3", file_path)
         
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:141.0) Gecko/20100101 Firefox/141.0',
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'{self.auth.BASE_URL}/',
+            **self._s3_headers,
             'Content-Type': mime_type,
-            'Content-Disposition': 'inline',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'cross-site'
+            'Content-Length': str(file_size)
         }
+        if content_sha256:
+            headers['X-Amz-Content-Sha256'] = content_sha256
         
-        logger.debug(f"vsput: PUT {upload_url}")
-        logger.debug(f"vsput: Headers: {headers}")
-        logger.debug(f"vsput: Content-Length: {len(file_content)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: PUT %s", upload_url)
+            logger.debug("vsput: Headers: %s", headers)
+            logger.debug("vsput: Content-Length: %s", file_size)
         
-        # Use a separate client for S3 upload (no cookies needed)
-        with httpx.Client() as s3_client:
-            response = s3_client.put(upload_url, content=file_content, headers=headers)
+        # Stream the file from disk in chunks rather than reading it into
+        # memory; the explicit Content-Length avoids chunked encoding.
+        # S3 doesn't need cookies, so use the anonymous client
+        with open(file_path, 'rb') as f:
+            response = self._anon_client.put(upload_url, content=_iter_file_chunks(f), headers=headers)
             response.raise_for_status()
         
-        logger.debug(f"vsput: S3 upload response status: {response.status_code}")
-        logger.debug(f"vsput: S3 upload response headers: {dict(response.headers)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: S3 upload response status: %s", response.status_code)
+            logger.debug("vsput: S3 upload response headers: %s", response.headers)
     
     def _options_request(self, upload_url: str) -> None:
-        """Step 3: OPTIONS request for CORS preflight."""
-        logger.debug(f"vsput: OPTIONS request for CORS preflight")
+        """Step 3: OPTIONS request for CORS preflight, once per origin."""
+        parsed = urlparse(upload_url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        if origin in self._preflighted:
+            logger.debug("vsput: Skipping CORS preflight, already sent to %s", origin)
+            return
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:141.0) Gecko/20100101 Firefox/141.0',
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Access-Control-Request-Method': 'PUT',
-            'Access-Control-Request-Headers': 'content-disposition,content-type',
-            'Referer': f'{self.auth.BASE_URL}/',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'cross-site',
-            'Priority': 'u=4'
-        }
+        logger.debug("vsput: OPTIONS request for CORS preflight")
         
-        # Use a separate client for OPTIONS request
-        with httpx.Client() as options_client:
-            response = options_client.options(upload_url, headers=headers)
-            response.raise_for_status()
+        response = self._anon_client.options(upload_url, headers=self._preflight_headers)
+        response.raise_for_status()
+        self._preflighted.add(origin)
         
-        logger.debug(f"vsput: OPTIONS response status: {response.status_code}")
+        logger.debug("vsput: OPTIONS response status: %s", response.status_code)
     
     def _finish_upload(self, temp_id: str, media_gid: str) -> Dict[str, Any]:
         """Step 4: Finish the upload process."""
@@ -251,79 +655,48 @@ class VSUploader:
             'replacement_type': ''
         }
         
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'{self.auth.BASE_URL}/media',
-            'Content-Type': 'application/json',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=4'
-        }
-        
-        # Don't duplicate headers - the client already has them
+        headers = self._api_headers
         
-        logger.debug(f"vsput: POST {url}")
-        logger.debug(f"vsput: Headers: {headers}")
-        logger.debug(f"vsput: Params: {params}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: POST %s", url)
+            logger.debug("vsput: Headers: %s", headers)
+            logger.debug("vsput: Params: %s", params)
         
         response = self.client.post(url, params=params, headers=headers)
         response.raise_for_status()
         
-        data = response.json()
-        logger.debug(f"vsput: Response status: {response.status_code}")
-        logger.debug(f"vsput: Response headers: {dict(response.headers)}")
-        logger.debug(f"vsput: Response body: {data}")
+        data = orjson.loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: Response status: %s", response.status_code)
+            logger.debug("vsput: Response headers: %s", response.headers)
+            logger.debug("vsput: Response body: %s", data)
         
         return data 
     
     def _fetch_metadata(self, meta_url: str) -> Optional[Dict[str, Any]]:
         """Step 5: Fetch metadata from CloudFront."""
-        logger.debug(f"vsput: Fetching metadata from CloudFront")
+        logger.debug("vsput: Fetching metadata from CloudFront")
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:141.0) Gecko/20100101 Firefox/141.0',
-            'Accept': '*/*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'{self.auth.BASE_URL}/',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'cross-site',
-            'Priority': 'u=4'
-        }
+        headers = self._cloudfront_headers
         
-        logger.debug(f"vsput: GET {meta_url}")
-        logger.debug(f"vsput: Headers: {headers}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: GET %s", meta_url)
+            logger.debug("vsput: Headers: %s", headers)
         
-        # Use a separate client for CloudFront request (no cookies needed)
-        with httpx.Client() as cf_client:
-            response = cf_client.get(meta_url, headers=headers)
-            response.raise_for_status()
+        # CloudFront doesn't need cookies, so use the anonymous client
+        response = self._anon_client.get(meta_url, headers=headers)
+        response.raise_for_status()
         
-        data = response.json()
-        logger.debug(f"vsput: CloudFront response status: {response.status_code}")
-        logger.debug(f"vsput: CloudFront response headers: {dict(response.headers)}")
-        logger.debug(f"vsput: CloudFront metadata: {data}")
+        data = orjson.loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: CloudFront response status: %s", response.status_code)
+            logger.debug("vsput: CloudFront response headers: %s", response.headers)
+            logger.debug("vsput: CloudFront metadata: %s", data)
         
         return data
     
-    def _batch_update(self, media_gid: str, metadata: Optional[Dict[str, Any]], subfolder: Optional[str] = None) -> None:
-        """Step 6: Batch update to associate file with folder and metadata."""
-        logger.debug(f"vsput: Batch updating media {media_gid}")
-        
-        url = f"{self.auth.BASE_URL}/api/publishing/media/batch"
-        
-        # Build the batch update payload
+    def _batch_item(self, media_gid: str, metadata: Optional[Dict[str, Any]], subfolder: Optional[str] = None) -> Dict[str, Any]:
+        """Build the batch update entry associating a file with its folder and metadata."""
         batch_item = {
             "media_gid": media_gid,
             "labels": [],
@@ -346,34 +719,29 @@ class VSUploader:
                 "pix_fmt": metadata.get("pix_fmt")
             })
         
-        payload = [batch_item]
+        return batch_item
+    
+    def _batch_update(self, batch_items: List[Dict[str, Any]], subfolder: Optional[str] = None) -> None:
+        """Step 6: Batch update to associate files with their folder and metadata."""
+        logger.debug("vsput: Batch updating %s media", len(batch_items))
         
-        headers = {
-            'User-Agent': 'VistaSocialUI',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br, zstd',
-            'Referer': f'{self.auth.BASE_URL}/media/{subfolder}' if subfolder else f'{self.auth.BASE_URL}/media',
-            'Content-Type': 'application/json',
-            'Origin': self.auth.BASE_URL,
-            'DNT': '1',
-            'Sec-GPC': '1',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors',
-            'Sec-Fetch-Site': 'same-origin',
-            'Priority': 'u=4'
-        }
+        url = f"{self.auth.BASE_URL}/api/publishing/media/batch"
+        
+        # The endpoint takes a list, so one request covers every file
+        payload = batch_items
         
-        # Don't duplicate headers - the client already has them
+        headers = self._with_subfolder_referer(self._api_headers, subfolder)
         
-        logger.debug(f"vsput: PUT {url}")
-        logger.debug(f"vsput: Headers: {headers}")
-        logger.debug(f"vsput: Payload: {payload}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: PUT %s", url)
+            logger.debug("vsput: Headers: %s", headers)
+            logger.debug("vsput: Payload: %s", payload)
         
         response = self.client.put(url, json=payload, headers=headers)
         response.raise_for_status()
         
-        data = response.json()
-        logger.debug(f"vsput: Batch update response status: {response.status_code}")
-        logger.debug(f"vsput: Batch update response headers: {dict(response.headers)}")
-        logger.debug(f"vsput: Batch update response body: {data}") 
\ No newline at end of file
+        data = orjson.loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("vsput: Batch update response status: %s", response.status_code)
+            logger.debug("vsput: Batch update response headers: %s", response.headers)
+            logger.debug("vsput: Batch update response body: %s", data)
\ No newline at end of file
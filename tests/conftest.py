@@ -0,0 +1,17 @@
+"""Shared fixtures for the vistacli tests."""
+
+import json
+
+import pytest
+
+from vistacli.auth import VSAuth
+
+
+@pytest.fixture
+def make_auth(tmp_path):
+    """Return a factory for VSAuth instances backed by an auth file in tmp_path."""
+    def factory(name="auth.json", cookies=None):
+        auth_file = tmp_path / name
+        auth_file.write_text(json.dumps(cookies if cookies is not None else {"session": name}))
+        return VSAuth(auth_file=auth_file)
+    return factory
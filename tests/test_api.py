@@ -0,0 +1,69 @@
+"""Tests for the Vista Social API client."""
+
+import httpx
+import orjson
+import pytest
+
+from vistacli.api import VSApi
+from vistacli.cache import VSCache
+
+
+def _api(auth, cache_file, folders):
+    """Build a VSApi whose requests are answered with the given folders."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, content=orjson.dumps({"data": folders}))
+
+    api = VSApi(auth=auth)
+    api.cache = VSCache(cache_file)
+    api.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return api, requests
+
+
+def test_get_folders_served_from_cache(tmp_path, make_auth):
+    api, requests = _api(make_auth(), tmp_path / "cache", [{"title": "A"}])
+
+    assert api.get_folders() == [{"title": "A"}]
+    assert api.get_folders() == [{"title": "A"}]
+    assert len(requests) == 1
+
+
+def test_auth_files_do_not_share_cached_folders(tmp_path, make_auth):
+    cache_file = tmp_path / "cache"
+    first, _ = _api(make_auth("first.json"), cache_file, [{"title": "First"}])
+    second, requests = _api(make_auth("second.json"), cache_file, [{"title": "Second"}])
+
+    assert first.get_folders() == [{"title": "First"}]
+    assert second.get_folders() == [{"title": "Second"}]
+    assert len(requests) == 1
+
+
+def test_stale_folders_are_not_served_to_another_account(tmp_path, make_auth):
+    cache_file = tmp_path / "cache"
+    first, _ = _api(make_auth("first.json"), cache_file, [{"title": "First"}])
+    first.get_folders()
+
+    second = VSApi(auth=make_auth("second.json"))
+    second.cache = VSCache(cache_file)
+    key = second._folders_cache_key(None, "")
+
+    assert second._stale_folders(key, httpx.ConnectError("down")) is None
+
+
+def test_delete_folder_quotes_the_folder_id(tmp_path, make_auth):
+    api, requests = _api(make_auth(), tmp_path / "cache", [])
+
+    api.delete_folder("a?b#c/d e")
+
+    assert requests[0].url.raw_path == b"/api/publishing/media/folder/a%3Fb%23c%2Fd%20e"
+
+
+def test_uncached_get_folders_skips_the_cache_key(tmp_path, make_auth, monkeypatch):
+    api, requests = _api(make_auth(), tmp_path / "cache", [{"title": "A"}])
+    api.cache = None
+    monkeypatch.setattr(api, '_folders_cache_key', lambda *args: pytest.fail("cache key built"))
+
+    assert api.get_folders() == [{"title": "A"}]
+    assert len(requests) == 1
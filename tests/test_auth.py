@@ -0,0 +1,25 @@
+"""Tests for cookie extraction and the auth file."""
+
+import sys
+import types
+from http.cookiejar import Cookie
+
+import pytest
+
+from vistacli.auth import VSAuth
+
+
+def _cookie(name, value):
+    return Cookie(0, name, value, None, False, 'vistasocial.com', True, False, '/', True,
+                  False, None, False, None, None, {})
+
+
+def test_extract_cookies_rereads_firefox(tmp_path, monkeypatch):
+    jars = [[], [_cookie('session', 'new')]]
+    fake = types.SimpleNamespace(firefox=lambda domain_name: jars.pop(0))
+    monkeypatch.setitem(sys.modules, 'browser_cookie3', fake)
+    auth = VSAuth(tmp_path / "auth.json")
+
+    with pytest.raises(RuntimeError):
+        auth.extract_cookies()
+    assert auth.extract_cookies() == {'session': 'new'}
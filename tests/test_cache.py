@@ -0,0 +1,66 @@
+"""Tests for the on-disk response cache."""
+
+from vistacli import cache as cache_module
+from vistacli.cache import VSCache
+
+
+def test_get_respects_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now[0])
+    cache = VSCache(tmp_path / "cache")
+
+    cache.set('k', {'v': 1}, ttl=30)
+    assert cache.get('k') == {'v': 1}
+
+    now[0] += 31
+    assert cache.get('k') is None
+    assert cache.get('k', allow_stale=True) == {'v': 1}
+
+
+def test_stale_fallback_respects_max_age(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now[0])
+    cache = VSCache(tmp_path / "cache")
+
+    cache.set('k', {'v': 1}, ttl=30)
+    now[0] += VSCache.MAX_AGE + 1
+
+    assert cache.get('k', allow_stale=True) is None
+
+
+def test_set_prunes_entries_past_max_age(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now[0])
+    cache = VSCache(tmp_path / "cache")
+
+    cache.set('old', 1, ttl=30)
+    now[0] += VSCache.MAX_AGE + 1
+    cache.set('new', 2, ttl=30)
+
+    assert cache.get('old', allow_stale=True) is None
+    assert cache.get('new') == 2
+
+
+def test_invalidate_by_prefix(tmp_path):
+    cache = VSCache(tmp_path / "cache")
+    folders = VSCache.make_key('folders', 'a')
+    other = VSCache.make_key('other', 'a')
+    cache.set(folders, 1, ttl=30)
+    cache.set(other, 2, ttl=30)
+
+    cache.invalidate('folders:')
+
+    assert cache.get(folders) is None
+    assert cache.get(other) == 2
+
+
+def test_make_key_distinguishes_parts(tmp_path):
+    assert VSCache.make_key('folders', 'a', 'b') != VSCache.make_key('folders', 'a', 'c')
+    assert VSCache.make_key('folders', None, '') == VSCache.make_key('folders', '', '')
+
+
+def test_unreadable_cache_is_empty(tmp_path):
+    cache_file = tmp_path / "cache"
+    cache_file.write_text("not json")
+
+    assert VSCache(cache_file).get('k') is None
@@ -0,0 +1,21 @@
+"""Tests for command-line helpers."""
+
+from vistacli.cli import _read_folder_rows
+
+
+def test_read_folder_rows():
+    lines = [
+        'Title only\n',
+        'With description,Some text\n',
+        'With labels,Desc, one ; two;;\n',
+        '\n',
+        ' ,skipped without a title\n',
+        '"Quoted, title",x\n',
+    ]
+
+    assert _read_folder_rows(lines) == [
+        {'name': 'Title only', 'description': '', 'labels': None},
+        {'name': 'With description', 'description': 'Some text', 'labels': None},
+        {'name': 'With labels', 'description': 'Desc', 'labels': ['one', 'two']},
+        {'name': 'Quoted, title', 'description': 'x', 'labels': None},
+    ]
@@ -0,0 +1,60 @@
+"""Tests for the upload session store."""
+
+import os
+import time
+
+import pytest
+
+from vistacli.sessions import STAGE_STARTED, STAGE_UPLOADED, VSUploadSessions
+
+
+def test_save_load_delete(tmp_path):
+    sessions = VSUploadSessions(tmp_path / "sessions")
+    session = {'media_gid': 'g1', 'temp_id': '1', 'stage': STAGE_STARTED}
+
+    sessions.save(session)
+    assert sessions.load('g1') == session
+
+    session['stage'] = STAGE_UPLOADED
+    sessions.save(session)
+    assert sessions.load('g1')['stage'] == STAGE_UPLOADED
+
+    sessions.delete('g1')
+    with pytest.raises(FileNotFoundError):
+        sessions.load('g1')
+
+
+def test_save_leaves_no_temp_files(tmp_path):
+    sessions = VSUploadSessions(tmp_path)
+
+    for media_gid in ('g1', 'g2'):
+        sessions.save({'media_gid': media_gid, 'stage': STAGE_STARTED})
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['g1.json', 'g2.json']
+
+
+def test_delete_missing_session_is_a_no_op(tmp_path):
+    VSUploadSessions(tmp_path).delete('missing')
+
+
+def test_unwritable_directory_is_ignored(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+
+    VSUploadSessions(blocker / "sessions").save({'media_gid': 'g1'})
+
+
+def test_prune_removes_old_sessions(tmp_path):
+    sessions = VSUploadSessions(tmp_path)
+    for media_gid in ('old', 'new'):
+        sessions.save({'media_gid': media_gid, 'stage': STAGE_STARTED})
+    week_ago = time.time() - 8 * 24 * 60 * 60
+    os.utime(tmp_path / "old.json", (week_ago, week_ago))
+
+    sessions.prune()
+
+    assert [path.name for path in tmp_path.iterdir()] == ['new.json']
+
+
+def test_prune_missing_directory(tmp_path):
+    VSUploadSessions(tmp_path / "missing").prune()
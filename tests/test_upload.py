@@ -0,0 +1,302 @@
+"""Tests for the media uploader."""
+
+import asyncio
+import hashlib
+import itertools
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import orjson
+import pytest
+
+from vistacli.sessions import STAGE_FINISHED, STAGE_STARTED, STAGE_UPLOADED, VSUploadSessions
+from vistacli.upload import VSUploader
+
+
+class FakeVistaSocial:
+    """MockTransport handler standing in for Vista Social, S3 and CloudFront."""
+
+    def __init__(self):
+        self.requests = []
+        self.uploaded = {}
+        self.fail_batch_for = set()
+        self.fail_finish = False
+        self.finish_errors = []
+        self.put_errors = []
+        self.put_started = threading.Event()
+        self.release_put = None
+        self._ids = itertools.count()
+
+    def __call__(self, request):
+        self.requests.append(request)
+        path = request.url.path
+
+        if path.endswith('/upload/start'):
+            i = next(self._ids)
+            return self._json({
+                'upload_url': f'https://s3.example.com/bucket/{i}?sig=1',
+                'media_gid': f'g{i}',
+                'meta_url': f'https://cdn.example.com/{i}.json'
+            })
+        if path.endswith('/upload/finish'):
+            if self.fail_finish:
+                return httpx.Response(400)
+            if self.finish_errors:
+                return httpx.Response(self.finish_errors.pop())
+            return self._json({'media_gid': request.url.params['id'], 'tempId': request.url.params['tempId']})
+        if path.endswith('/media/batch'):
+            items = orjson.loads(request.content)
+            if any(item['media_gid'] in self.fail_batch_for for item in items):
+                return httpx.Response(400)
+            return self._json({'updated': len(items)})
+        if request.url.host == 'cdn.example.com':
+            return self._json({'width': 640, 'height': 480, 'aspect_ratio': '4:3'})
+        if request.url.host == 's3.example.com':
+            if self.put_errors:
+                return httpx.Response(self.put_errors.pop())
+            self.put_started.set()
+            if self.release_put is not None:
+                self.release_put.wait()
+            self.uploaded[path] = request.read()
+            return httpx.Response(200)
+        return httpx.Response(404)
+
+    @staticmethod
+    def _json(body):
+        return httpx.Response(200, content=orjson.dumps(body))
+
+    def paths(self, method):
+        return [r.url.path for r in self.requests if r.method == method]
+
+
+@pytest.fixture
+def server():
+    return FakeVistaSocial()
+
+
+@pytest.fixture
+def uploader(tmp_path, make_auth, server):
+    transport = httpx.MockTransport(server)
+    uploader = VSUploader(make_auth(), sessions=VSUploadSessions(tmp_path / "sessions"))
+    uploader.client.close()
+    uploader._anon_client.close()
+    uploader.client = httpx.Client(transport=transport)
+    uploader._anon_client = httpx.Client(transport=transport)
+    with uploader:
+        yield uploader
+
+
+@pytest.fixture
+def make_images(tmp_path):
+    def factory(count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"image{i}.png"
+            path.write_bytes(b"\x89PNG" + bytes([i]) * 100)
+            paths.append(str(path))
+        return paths
+    return factory
+
+
+def test_upload_files_sends_one_batch_update(uploader, server, make_images):
+    results = asyncio.run(uploader.upload_files(make_images(3)))
+
+    assert all(isinstance(result, dict) for result in results)
+    assert server.paths('PUT').count('/api/publishing/media/batch') == 1
+    assert list(uploader.sessions.sessions_dir.glob('*.json')) == []
+
+
+def test_image_dimensions_are_sent_in_the_batch_update(uploader, server, make_images):
+    asyncio.run(uploader.upload_files(make_images(1)))
+
+    batch = next(r for r in server.requests if r.url.path.endswith('/media/batch'))
+    item = orjson.loads(batch.content)[0]
+    assert (item['width'], item['height'], item['aspect_ratio']) == (640, 480, '4:3')
+
+
+def test_batch_failure_falls_back_to_single_updates(uploader, server, make_images):
+    server.fail_batch_for = {'g1'}
+
+    results = asyncio.run(uploader.upload_files(make_images(3)))
+
+    failed = [result for result in results if isinstance(result, Exception)]
+    assert len(failed) == 1
+    assert isinstance(failed[0], httpx.HTTPStatusError)
+    # One combined attempt, then one request per file
+    assert server.paths('PUT').count('/api/publishing/media/batch') == 4
+    # Only the failed file keeps its session for --resume
+    assert len(list(uploader.sessions.sessions_dir.glob('*.json'))) == 1
+
+
+def _started_session(uploader, server, path, stage):
+    """Begin an upload and mark its session as having reached stage."""
+    session = uploader._begin_upload(path)
+    if stage == STAGE_FINISHED:
+        session['result'] = {'media_gid': session['media_gid']}
+    session['stage'] = stage
+    uploader.sessions.save(session)
+    server.requests.clear()
+    return session
+
+
+@pytest.mark.parametrize("stage, expected", [
+    (STAGE_STARTED, ['PUT /bucket/0', 'POST /api/publishing/media/upload/finish']),
+    (STAGE_UPLOADED, ['POST /api/publishing/media/upload/finish']),
+    (STAGE_FINISHED, []),
+])
+def test_resume_continues_after_the_recorded_stage(uploader, server, make_images, stage, expected):
+    session = _started_session(uploader, server, make_images(1)[0], stage)
+
+    result = uploader.resume(session['media_gid'])
+
+    assert result['media_gid'] == session['media_gid']
+    sent = [f"{r.method} {r.url.path}" for r in server.requests]
+    assert sent == expected + ['GET /0.json', 'PUT /api/publishing/media/batch']
+    with pytest.raises(FileNotFoundError):
+        uploader.sessions.load(session['media_gid'])
+
+
+def test_resume_rejects_a_file_resized_before_reaching_s3(uploader, server, make_images):
+    path = make_images(1)[0]
+    session = _started_session(uploader, server, path, STAGE_STARTED)
+    Path(path).write_bytes(b"changed")
+
+    with pytest.raises(ValueError):
+        uploader.resume(session['media_gid'])
+    # It would fail the same way again, so the session isn't kept
+    with pytest.raises(FileNotFoundError):
+        uploader.sessions.load(session['media_gid'])
+
+
+def test_resume_unknown_session(uploader):
+    with pytest.raises(FileNotFoundError):
+        uploader.resume('missing')
+
+
+def test_transient_failure_is_retried_without_resending_to_s3(uploader, server, make_images):
+    server.finish_errors = [503]
+
+    results = asyncio.run(uploader.upload_files(make_images(3), concurrency=2))
+
+    assert all(isinstance(result, dict) for result in results)
+    # One finish per file plus the retried one, but each file sent to S3 once
+    assert server.paths('POST').count('/api/publishing/media/upload/finish') == 4
+    assert sum(1 for r in server.requests if r.url.host == 's3.example.com') == 3
+
+
+def test_permanent_s3_rejection_drops_the_session(uploader, server, make_images, caplog):
+    server.put_errors = [403]
+
+    results = asyncio.run(uploader.upload_files(make_images(1)))
+
+    assert isinstance(results[0], httpx.HTTPStatusError)
+    assert list(uploader.sessions.sessions_dir.glob('*.json')) == []
+    assert '--resume' not in caplog.text
+
+
+@pytest.mark.parametrize("put_errors, finish_errors", [([503], []), ([], [400])])
+def test_transient_or_post_s3_failure_keeps_the_session(uploader, server, make_images, caplog, put_errors, finish_errors):
+    server.put_errors = put_errors
+    server.finish_errors = finish_errors
+
+    with pytest.raises(httpx.HTTPStatusError):
+        uploader.upload_file(make_images(1)[0])
+
+    assert uploader.sessions.load('g0')
+    assert '--resume g0' in caplog.text
+
+
+def test_upload_files_reports_each_file_in_order(uploader, server, make_images, tmp_path):
+    paths = make_images(2)
+    unsupported = tmp_path / "notes.txt"
+    unsupported.write_text("x")
+
+    results = asyncio.run(uploader.upload_files([paths[0], str(unsupported), str(tmp_path / "gone.png"), paths[1]]))
+
+    assert isinstance(results[0], dict)
+    assert isinstance(results[1], ValueError)
+    assert isinstance(results[2], FileNotFoundError)
+    assert isinstance(results[3], dict)
+
+
+def test_sessions_with_colliding_temp_ids_are_kept_apart(uploader, server, make_images, monkeypatch):
+    monkeypatch.setattr(uploader, '_generate_temp_id', lambda: '1700000000000')
+    server.fail_finish = True
+
+    results = asyncio.run(uploader.upload_files(make_images(2)))
+
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+    saved = sorted(path.stem for path in uploader.sessions.sessions_dir.glob('*.json'))
+    assert saved == ['g0', 'g1']
+
+    server.fail_finish = False
+    for media_gid in saved:
+        assert uploader.resume(media_gid)['media_gid'] == media_gid
+    assert list(uploader.sessions.sessions_dir.iterdir()) == []
+
+
+def test_content_sha256_is_only_sent_when_enabled(uploader, server, make_images):
+    asyncio.run(uploader.upload_files(make_images(1)))
+    put = next(r for r in server.requests if r.url.host == 's3.example.com')
+    assert 'X-Amz-Content-Sha256' not in put.headers
+
+    uploader._send_content_sha256 = True
+    path = make_images(1)[0]
+    asyncio.run(uploader.upload_files([path]))
+    put = [r for r in server.requests if r.url.host == 's3.example.com'][-1]
+    assert put.headers['X-Amz-Content-Sha256'] == hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_upload_files_rejects_non_positive_concurrency(uploader, make_images, concurrency):
+    with pytest.raises(ValueError):
+        asyncio.run(uploader.upload_files(make_images(2), concurrency=concurrency))
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 50])
+def test_upload_files_completes_for_any_valid_concurrency(uploader, make_images, concurrency):
+    results = asyncio.run(asyncio.wait_for(uploader.upload_files(make_images(5), concurrency=concurrency), timeout=10))
+
+    assert all(isinstance(result, dict) for result in results)
+
+
+def test_upload_files_with_no_files(uploader):
+    assert asyncio.run(uploader.upload_files([])) == []
+
+
+def test_cancelling_upload_files_does_not_wait_for_running_puts(uploader, server, make_images):
+    server.release_put = threading.Event()
+    # Frees the stuck PUT eventually, even if cancellation blocks
+    timer = threading.Timer(5, server.release_put.set)
+    timer.start()
+
+    async def cancel_mid_upload():
+        task = asyncio.ensure_future(uploader.upload_files(make_images(1)))
+        while not server.put_started.is_set():
+            await asyncio.sleep(0.01)
+        started = time.monotonic()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.monotonic() - started
+
+    try:
+        assert asyncio.run(cancel_mid_upload()) < 1
+    finally:
+        server.release_put.set()
+        timer.cancel()
+
+
+@pytest.mark.parametrize("value, enabled", [
+    ("1", True), ("true", True), ("YES", True), ("on", True),
+    ("0", False), ("false", False), ("no", False), ("", False),
+])
+def test_env_switches(monkeypatch, make_auth, value, enabled):
+    monkeypatch.setenv("VSUPLOAD_SEND_PREFLIGHT", value)
+    monkeypatch.setenv("VSUPLOAD_SEND_CONTENT_SHA256", value)
+
+    with VSUploader(make_auth()) as uploader:
+        assert uploader._send_preflight is enabled
+        assert uploader._send_content_sha256 is enabled